@@ -4,16 +4,34 @@ Code Analysis API - Server Component
 Run with: uvicorn code_analyzer_api:app --reload
 """
 
-import subprocess
+import asyncio
+import contextlib
+import hashlib
+import io
+import logging
+import multiprocessing
+import signal
+import sys
 import tempfile
 import os
-import re
-import json
+import threading
+import anyio.to_thread
+from collections import OrderedDict
+import pytest
+from pytest_jsonreport.plugin import JSONReport
+from bandit.core import config as bandit_config
+from bandit.core import issue as bandit_issue
+from bandit.core import manager as bandit_manager
+from flake8.api import legacy as flake8_legacy
+from flake8.formatting.base import BaseFormatter
+from flake8.main.options import JobsArgument
 from fastapi import FastAPI
-from pydantic import BaseModel
-from typing import Optional, List
+from pydantic import BaseModel, Field
+from typing import Optional, List, Tuple, Dict, Callable
 from fastapi.middleware.cors import CORSMiddleware
 
+logger = logging.getLogger(__name__)
+
 # ===== FASTAPI SERVER SETUP =====
 
 app = FastAPI(title="Code Analysis API")
@@ -47,12 +65,19 @@ class TestResult(BaseModel):
     test_name: str
     passed: bool
     output: str
+    traceback: Optional[str] = None
 
 class CodeSubmission(BaseModel):
     code: str
     test_code: Optional[str] = None
     language: str = "python"
 
+# One flake8 run and one 30s timeout cover the whole batch, so keep batches small
+MAX_BATCH_SIZE = 50
+
+class BatchSubmission(BaseModel):
+    items: List[CodeSubmission] = Field(max_length=MAX_BATCH_SIZE)
+
 class AnalysisResult(BaseModel):
     lint_issues: List[LintIssue]
     lint_summary: dict
@@ -65,65 +90,120 @@ class AnalysisResult(BaseModel):
 
 # ===== ANALYSIS ENGINE =====
 
-def parse_flake8_output(output: str) -> dict:
-    """Convert flake8 raw output to structured data"""
-    issues = []
+async def run_command(args: List[str], cwd: Optional[str] = None, timeout: int = 30) -> Tuple[int, str, str]:
+    """Run a command without blocking the event loop and return (returncode, stdout, stderr)"""
+    # Own session, so a timeout can take down any workers the tool forked as well
+    process = await asyncio.create_subprocess_exec(
+        *args,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        cwd=cwd,
+        start_new_session=True
+    )
 
-    for line in output.strip().split('\n'):
-        if not line:
-            continue
+    try:
+        stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=timeout)
+    except asyncio.TimeoutError:
+        with contextlib.suppress(ProcessLookupError):
+            os.killpg(process.pid, signal.SIGKILL)
+        await process.wait()
+        raise
 
-        match = re.match(r'[^:]+:(\d+):(\d+): (\w+)\s+(.+)', line)
-        if match:
-            line_num, col_num, code, message = match.groups()
-
-            if code.startswith('E') or code.startswith('F'):
-                severity = 'error'
-            elif code.startswith('W'):
-                severity = 'warning'
-            else:
-                severity = 'info'
-
-            issues.append({
-                'line': int(line_num),
-                'column': int(col_num),
-                'message': message.strip(),
-                'code': code,
-                'severity': severity
-            })
+    return process.returncode, stdout.decode(), stderr.decode()
 
-    summary = {
+# Keep scratch files in RAM when a tmpfs is available
+SCRATCH_DIR = '/dev/shm' if os.path.isdir('/dev/shm') else None
+
+def write_temp_file(code: str) -> str:
+    """Write code to a temporary .py file and return its path"""
+    with tempfile.NamedTemporaryFile(mode='w', suffix='.py', dir=SCRATCH_DIR, delete=False) as f:
+        f.write(code)
+        return f.name
+
+def remove_temp_file(path: str):
+    """Delete a temp file, ignoring one that is already gone"""
+    with contextlib.suppress(FileNotFoundError):
+        os.unlink(path)
+
+def lint_severity(code: str) -> str:
+    """Map a flake8 error code to its severity"""
+    prefix = code[0]
+    if prefix in 'EF':
+        return 'error'
+    elif prefix == 'W':
+        return 'warning'
+    return 'info'
+
+class LintCollector(BaseFormatter):
+    """flake8 formatter that collects violations as issue dicts instead of printing them"""
+
+    def after_init(self):
+        self.issues = []
+
+    def handle(self, error):
+        self.issues.append({
+            'line': error.line_number,
+            'column': error.column_number,
+            'message': error.text.strip(),
+            'code': error.code,
+            'severity': lint_severity(error.code)
+        })
+
+def summarize_lint_issues(issues: List[dict]) -> dict:
+    """Count lint issues by severity"""
+    severity_counts = {'error': 0, 'warning': 0, 'info': 0}
+    for issue in issues:
+        severity_counts[issue['severity']] += 1
+
+    return {
         'total_issues': len(issues),
-        'errors': len([i for i in issues if i['severity'] == 'error']),
-        'warnings': len([i for i in issues if i['severity'] == 'warning']),
-        'info': len([i for i in issues if i['severity'] == 'info'])
+        'errors': severity_counts['error'],
+        'warnings': severity_counts['warning'],
+        'info': severity_counts['info']
     }
 
-    return {'issues': issues, 'summary': summary}
-
-def run_flake8_analysis(code: str) -> dict:
-    """Run flake8 on the provided code and return structured results"""
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
-        f.write(code)
-        temp_file = f.name
+# The style guide is built once on startup; it keeps per-run state, so checks are serialized
+flake8_guide = None
+flake8_lock = threading.Lock()
+
+def create_flake8_guide():
+    """Load flake8's options and plugins and report through LintCollector"""
+    # One file per check: never spin up flake8's multiprocessing pool for it
+    guide = flake8_legacy.get_style_guide(jobs=JobsArgument('1'))
+    guide.init_report(LintCollector)
+    return guide
+
+def lint_with_flake8(path: str, timeout: int = 30) -> List[dict]:
+    """Run flake8 in-process on a file and return its issues"""
+    # A timed-out check keeps running (and holding the lock) in its abandoned thread;
+    # give up by the time the caller does instead of piling up more threads behind it
+    if not flake8_lock.acquire(timeout=timeout):
+        raise asyncio.TimeoutError
+    try:
+        collector = flake8_guide._application.formatter
+        collector.issues = []
+        # Statistics are keyed by file name and never read here; don't let them pile up
+        flake8_guide._application.guide.stats._store.clear()
+        flake8_guide.check_files([path])
+        return collector.issues
+    finally:
+        flake8_lock.release()
 
+async def run_flake8_analysis(code_file: str) -> dict:
+    """Run flake8 on the code in code_file and return structured results"""
     try:
-        result = subprocess.run(
-            ['flake8', temp_file],
-            capture_output=True,
-            text=True,
+        issues = await asyncio.wait_for(
+            anyio.to_thread.run_sync(lint_with_flake8, code_file, abandon_on_cancel=True),
             timeout=30
         )
 
-        structured_results = parse_flake8_output(result.stdout)
-
         return {
-            **structured_results,
-            'raw_output': result.stdout,
+            'issues': issues,
+            'summary': summarize_lint_issues(issues),
             'success': True
         }
 
-    except subprocess.TimeoutExpired:
+    except asyncio.TimeoutError:
         return {
             'issues': [],
             'summary': {'total_issues': 0, 'errors': 0, 'warnings': 0, 'info': 0},
@@ -137,32 +217,27 @@ def run_flake8_analysis(code: str) -> dict:
             'success': False,
             'error': str(e)
         }
-    finally:
-        if os.path.exists(temp_file):
-            os.unlink(temp_file)
 
-def parse_bandit_output(bandit_data: dict) -> dict:
-    """Parse Bandit JSON output into structured results"""
+def parse_bandit_output(issues: List[bandit_issue.Issue]) -> dict:
+    """Convert Bandit's issue objects into structured results"""
     security_issues = []
+    severity_counts = {'high': 0, 'medium': 0, 'low': 0}
 
-    for issue in bandit_data.get('results', []):
-        cwe_id = issue.get('issue_cwe', {}).get('id', 'N/A')
-        cwe_str = str(cwe_id) if cwe_id != 'N/A' else 'N/A'
+    for issue in issues:
+        cwe_str = str(issue.cwe.id) if issue.cwe.id != bandit_issue.Cwe.NOTSET else 'N/A'
+        severity = issue.severity.lower()
+        severity_counts[severity] += 1
 
         security_issues.append({
-            'line': issue['line_number'],
-            'message': issue['issue_text'],
-            'code': issue['test_id'],
-            'severity': issue['issue_severity'].lower(),
-            'confidence': issue['issue_confidence'].lower(),
+            'line': issue.lineno,
+            'message': issue.text,
+            'code': issue.test_id,
+            'severity': severity,
+            'confidence': issue.confidence.lower(),
             'cwe': cwe_str,
-            'description': f"{issue['issue_text']} (CWE: {cwe_str})"
+            'description': f"{issue.text} (CWE: {cwe_str})"
         })
 
-    severity_counts = {'high': 0, 'medium': 0, 'low': 0}
-    for issue in security_issues:
-        severity_counts[issue['severity']] += 1
-
     summary = {
         'total_issues': len(security_issues),
         'high': severity_counts['high'],
@@ -176,40 +251,27 @@ def parse_bandit_output(bandit_data: dict) -> dict:
         'success': True
     }
 
-def run_security_analysis(code: str) -> dict:
-    """Run Bandit security analysis on the provided code"""
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
-        f.write(code)
-        temp_file = f.name
+# Bandit's config is read once; managers hold per-scan results so each scan gets its own
+BANDIT_CONFIG = bandit_config.BanditConfig()
+
+def scan_with_bandit(path: str) -> List[bandit_issue.Issue]:
+    """Run Bandit's tests in-process and return the issues it found"""
+    manager = bandit_manager.BanditManager(BANDIT_CONFIG, 'file')
+    manager.discover_files([path])
+    manager.run_tests()
 
+    return manager.get_issue_list()
+
+async def run_security_analysis(code_file: str) -> dict:
+    """Run Bandit security analysis on the code in code_file"""
     try:
-        result = subprocess.run(
-            ['bandit', '-f', 'json', temp_file],
-            capture_output=True,
-            text=True,
+        issues = await asyncio.wait_for(
+            anyio.to_thread.run_sync(scan_with_bandit, code_file, abandon_on_cancel=True),
             timeout=30
         )
+        return parse_bandit_output(issues)
 
-        if result.returncode in [0, 1]:
-            try:
-                bandit_results = json.loads(result.stdout)
-                return parse_bandit_output(bandit_results)
-            except json.JSONDecodeError:
-                return {
-                    'security_issues': [],
-                    'summary': {'total_issues': 0, 'high': 0, 'medium': 0, 'low': 0},
-                    'success': False,
-                    'error': 'Failed to parse Bandit output'
-                }
-        else:
-            return {
-                'security_issues': [],
-                'summary': {'total_issues': 0, 'high': 0, 'medium': 0, 'low': 0},
-                'success': False,
-                'error': f'Security scan failed: {result.stderr}'
-            }
-
-    except subprocess.TimeoutExpired:
+    except asyncio.TimeoutError:
         return {
             'security_issues': [],
             'summary': {'total_issues': 0, 'high': 0, 'medium': 0, 'low': 0},
@@ -223,38 +285,41 @@ def run_security_analysis(code: str) -> dict:
             'success': False,
             'error': f'Security analysis failed: {str(e)}'
         }
-    finally:
-        if os.path.exists(temp_file):
-            os.unlink(temp_file)
 
-def parse_pytest_output(output: str) -> dict:
-    """Parse pytest verbose output into structured results"""
+def parse_pytest_report(report: dict) -> dict:
+    """Parse a pytest-json-report document into structured results"""
     test_cases = []
-    lines = output.strip().split('\n')
 
     total_tests = 0
     passed = 0
     failed = 0
 
-    for line in lines:
-        line = line.strip()
-
-        match = re.match(r'(.+?)::(.+?) (PASSED|FAILED|ERROR)', line)
-        if match:
-            filename, test_name, status = match.groups()
-            total_tests += 1
-
-            if status == 'PASSED':
-                passed += 1
-            else:
-                failed += 1
+    for test in report.get('tests', []):
+        status = test['outcome']
+        if status not in ('passed', 'failed', 'error'):
+            continue
 
-            test_cases.append({
-                'test_name': test_name,
-                'passed': status == 'PASSED',
-                'status': status.lower(),
-                'output': line
-            })
+        total_tests += 1
+        traceback = None
+        if status == 'passed':
+            passed += 1
+        else:
+            failed += 1
+            # Failures carry the traceback on whichever stage broke
+            failed_stage = next(
+                (test[stage] for stage in ('setup', 'call', 'teardown')
+                 if test.get(stage, {}).get('outcome') == 'failed'),
+                {}
+            )
+            traceback = failed_stage.get('longrepr')
+
+        test_cases.append({
+            'test_name': test['nodeid'].split('::', 1)[-1],
+            'passed': status == 'passed',
+            'status': status,
+            'output': f"{test['nodeid']} {status.upper()}",
+            'traceback': traceback
+        })
 
     return {
         'test_cases': test_cases,
@@ -266,13 +331,112 @@ def parse_pytest_output(output: str) -> dict:
         }
     }
 
-def run_pytest_analysis(code: str, test_code: str = None) -> dict:
+PYTEST_WORKERS = min(4, os.cpu_count() or 1)
+
+# Created on startup; every test run gets a fresh process so submissions can't leak state
+pytest_context = None
+pytest_slots = None
+
+def create_pytest_context():
+    """Set up the forkserver that test processes are started from"""
+    # Test processes fork from a small server process that already has this module (and
+    # pytest) imported, rather than copying the whole app or re-importing everything per run
+    context = multiprocessing.get_context('forkserver')
+    context.set_forkserver_preload([__name__])
+    return context
+
+def run_pytest_in_worker(temp_dir: str, code: str, test_code: str, timeout: int = 30) -> dict:
+    """Test process: run the tests with pytest.main and return the JSON report"""
+    code_file = os.path.join(temp_dir, "code_under_test.py")
+    test_file = os.path.join(temp_dir, "test_code.py")
+
+    # Write both files to the same directory
+    with open(code_file, 'w') as f:
+        f.write(code)
+        logger.debug("PYTEST: Wrote code to %s", code_file)
+
+    with open(test_file, 'w') as f:
+        # Add import statement to access the functions from code_under_test
+        f.write("from code_under_test import *\n\n")
+        f.write(test_code)
+        logger.debug("PYTEST: Wrote tests to %s", test_file)
+
+    logger.debug("PYTEST: Created files in temp dir: %s", temp_dir)
+
+    plugin = JSONReport()
+    output = io.StringIO()
+    timed_out = False
+
+    def handle_timeout(signum, frame):
+        nonlocal timed_out
+        timed_out = True
+        pytest.exit('Test execution timed out')
+
+    signal.signal(signal.SIGALRM, handle_timeout)
+    signal.alarm(timeout)
+    try:
+        os.chdir(temp_dir)  # Run in the temp directory
+        with contextlib.redirect_stdout(output):
+            exit_code = pytest.main(
+                [test_file, '--tb=short', '-q', '--no-header',
+                 '-p', 'no:cacheprovider', '--json-report-file=none',
+                 # Plugins are already imported in the process; don't warn about rewriting them
+                 '-W', 'ignore::pytest.PytestAssertRewriteWarning'],
+                plugins=[plugin]
+            )
+    finally:
+        signal.alarm(0)
+
+    return {
+        'report': plugin.report,
+        'raw_output': output.getvalue(),
+        'exit_code': int(exit_code),
+        'timed_out': timed_out
+    }
+
+def pytest_process_main(sender, temp_dir: str, code: str, test_code: str):
+    """Test process entry point: run the tests and send back the result or the exception"""
+    # Submissions are imported once, so never write .pyc files for them
+    sys.dont_write_bytecode = True
+    try:
+        result = run_pytest_in_worker(temp_dir, code, test_code)
+    except Exception as e:
+        result = e
+    sender.send(result)
+    sender.close()
+
+def run_pytest_process(code: str, test_code: str, timeout: int = 35) -> dict:
+    """Run the tests in a fresh process and kill it if it outlives the timeout"""
+    # Owned by this side so the files are removed even when the process gets killed
+    with tempfile.TemporaryDirectory(dir=SCRATCH_DIR) as temp_dir:
+        receiver, sender = pytest_context.Pipe(duplex=False)
+        process = pytest_context.Process(
+            target=pytest_process_main, args=(sender, temp_dir, code, test_code)
+        )
+        process.start()
+        sender.close()
+        try:
+            # The process enforces the timeout itself; this only stops one that got past it
+            if not receiver.poll(timeout):
+                raise asyncio.TimeoutError
+            # Raises EOFError if the process died without sending anything
+            result = receiver.recv()
+        finally:
+            process.kill()
+            process.join()
+            receiver.close()
+
+    if isinstance(result, Exception):
+        raise result
+    return result
+
+async def run_pytest_analysis(code: str, test_code: str = None) -> dict:
     """Run pytest on the provided code and return structured results"""
-    print(f"🔍 PYTEST DEBUG: Starting pytest analysis")
-    print(f"🔍 PYTEST DEBUG: Code length: {len(code)}, Test code: {'provided' if test_code else 'none'}")
+    logger.debug("PYTEST: Starting pytest analysis")
+    logger.debug("PYTEST: Code length: %d, Test code: %s", len(code), 'provided' if test_code else 'none')
 
-    if not test_code:
-        print("🔍 PYTEST DEBUG: No test code provided, returning empty")
+    if not (test_code and test_code.strip()):
+        logger.debug("PYTEST: No test code provided, returning empty")
         return {
             'test_cases': [],
             'summary': {
@@ -284,97 +448,354 @@ def run_pytest_analysis(code: str, test_code: str = None) -> dict:
             'success': True
         }
 
-    # Create temporary directory for both files
-    with tempfile.TemporaryDirectory() as temp_dir:
-        code_file = os.path.join(temp_dir, "code_under_test.py")
-        test_file = os.path.join(temp_dir, "test_code.py")
+    try:
+        async with pytest_slots:
+            result = await anyio.to_thread.run_sync(run_pytest_process, code, test_code)
+
+        logger.debug("PYTEST: Pytest exit code: %s", result['exit_code'])
+        logger.debug("PYTEST: Pytest output:\n%s", result['raw_output'])
+
+        if result['timed_out']:
+            raise asyncio.TimeoutError
+
+        test_results = parse_pytest_report(result['report'])
+        logger.debug("PYTEST: Parsed %d test cases", len(test_results['test_cases']))
+
+        return {
+            'test_cases': test_results['test_cases'],
+            'summary': test_results['summary'],
+            'raw_output': result['raw_output'],
+            'success': True
+        }
+
+    except asyncio.TimeoutError:
+        logger.debug("PYTEST: Timeout")
+        return {
+            'test_cases': [],
+            'summary': {'total_tests': 0, 'passed': 0, 'failed': 0, 'success': False},
+            'success': False,
+            'error': 'Test execution timed out'
+        }
+    except EOFError:
+        # Submitted code killed its own test process
+        logger.warning("PYTEST: Test process exited unexpectedly")
+        return {
+            'test_cases': [],
+            'summary': {'total_tests': 0, 'passed': 0, 'failed': 0, 'success': False},
+            'success': False,
+            'error': 'Test execution failed: test process exited unexpectedly'
+        }
+    except Exception as e:
+        logger.debug("PYTEST: Exception: %s", e)
+        return {
+            'test_cases': [],
+            'summary': {'total_tests': 0, 'passed': 0, 'failed': 0, 'success': False},
+            'success': False,
+            'error': f'Test execution failed: {str(e)}'
+        }
+
+# ===== BATCH ANALYSIS =====
 
-        # Write both files to the same directory
-        with open(code_file, 'w') as f:
+def write_batch_files(temp_dir: str, sources: Dict[str, str]) -> Dict[str, str]:
+    """Write each source into temp_dir and return the filename used for each key"""
+    filenames = {}
+    for i, (key, code) in enumerate(sources.items()):
+        filenames[key] = f"item_{i}.py"
+        with open(os.path.join(temp_dir, filenames[key]), 'w') as f:
             f.write(code)
-            print(f"🔍 PYTEST DEBUG: Wrote code to {code_file}")
+    return filenames
 
-        with open(test_file, 'w') as f:
-            # Add import statement to access the functions from code_under_test
-            test_content = "from code_under_test import *\n\n" + test_code
-            f.write(test_content)
-            print(f"🔍 PYTEST DEBUG: Wrote tests to {test_file}")
+def parse_flake8_output(output: str) -> Dict[str, List[dict]]:
+    """Convert flake8 raw output to issues grouped by file name"""
+    issues_by_file = {}
 
-        print(f"🔍 PYTEST DEBUG: Created files in temp dir: {temp_dir}")
+    for line in output.splitlines():
+        # path:row:col: CODE message -- batch temp paths never contain ':'
+        parts = line.split(':', 3)
+        if len(parts) != 4:
+            continue
 
-        try:
-            # Run pytest on the test file
-            result = subprocess.run(
-                ['pytest', test_file, '-v', '--tb=short'],
-                capture_output=True,
-                text=True,
-                timeout=30,
-                cwd=temp_dir  # Run in the temp directory
-            )
+        path, line_num, col_num, rest = parts
+        code, _, message = rest.lstrip().partition(' ')
 
-            print(f"🔍 PYTEST DEBUG: Pytest return code: {result.returncode}")
-            print(f"🔍 PYTEST DEBUG: Pytest stdout:\n{result.stdout}")
-            print(f"🔍 PYTEST DEBUG: Pytest stderr:\n{result.stderr}")
+        issues_by_file.setdefault(os.path.basename(path), []).append({
+            'line': int(line_num),
+            'column': int(col_num),
+            'message': message.strip(),
+            'code': code,
+            'severity': lint_severity(code)
+        })
+
+    return issues_by_file
 
-            # Parse pytest output
-            test_results = parse_pytest_output(result.stdout)
-            print(f"🔍 PYTEST DEBUG: Parsed {len(test_results['test_cases'])} test cases")
+async def run_flake8_batch(temp_dir: str, filenames: Dict[str, str]) -> Dict[str, dict]:
+    """Lint every batch file with a single flake8 run and return results per key"""
+    # Largest files first, so flake8's parallel workers finish at about the same time
+    ordered = sorted(
+        (os.path.join(temp_dir, name) for name in filenames.values()),
+        key=os.path.getsize,
+        reverse=True
+    )
+
+    try:
+        # Run from the server's directory so flake8 picks up the same config as the
+        # in-process style guide; both feed lint_cache
+        returncode, stdout, stderr = await run_command(['flake8', '--jobs=auto', *ordered])
 
-            return {
-                'test_cases': test_results['test_cases'],
-                'summary': test_results['summary'],
-                'raw_output': result.stdout,
+        if returncode not in [0, 1]:
+            raise RuntimeError(stderr.strip() or f'flake8 exited with code {returncode}')
+
+        issues_by_file = parse_flake8_output(stdout)
+
+        results = {}
+        for key, name in filenames.items():
+            issues = issues_by_file.get(name, [])
+            results[key] = {
+                'issues': issues,
+                'summary': summarize_lint_issues(issues),
                 'success': True
             }
+        return results
 
-        except subprocess.TimeoutExpired:
-            print("🔍 PYTEST DEBUG: Timeout")
-            return {
-                'test_cases': [],
-                'summary': {'total_tests': 0, 'passed': 0, 'failed': 0, 'success': False},
-                'success': False,
-                'error': 'Test execution timed out'
-            }
-        except Exception as e:
-            print(f"🔍 PYTEST DEBUG: Exception: {e}")
-            return {
-                'test_cases': [],
-                'summary': {'total_tests': 0, 'passed': 0, 'failed': 0, 'success': False},
-                'success': False,
-                'error': f'Test execution failed: {str(e)}'
-            }
+    except asyncio.TimeoutError:
+        error = 'Analysis timed out'
+    except Exception as e:
+        error = str(e)
+
+    return {key: {
+        'issues': [],
+        'summary': {'total_issues': 0, 'errors': 0, 'warnings': 0, 'info': 0},
+        'success': False,
+        'error': error
+    } for key in filenames}
+
+def scan_batch_with_bandit(paths: List[str]) -> Dict[str, List[bandit_issue.Issue]]:
+    """Run Bandit once over several files and return the issues found in each path"""
+    manager = bandit_manager.BanditManager(BANDIT_CONFIG, 'file')
+    manager.discover_files(paths)
+    manager.run_tests()
+
+    issues_by_path = {path: [] for path in paths}
+    for issue in manager.get_issue_list():
+        issues_by_path[issue.fname].append(issue)
+    return issues_by_path
+
+async def run_security_batch(temp_dir: str, filenames: Dict[str, str]) -> Dict[str, dict]:
+    """Scan every batch file with a single Bandit run and return results per key"""
+    paths = {key: os.path.join(temp_dir, name) for key, name in filenames.items()}
+
+    try:
+        issues_by_path = await asyncio.wait_for(
+            anyio.to_thread.run_sync(scan_batch_with_bandit, list(paths.values()), abandon_on_cancel=True),
+            timeout=30
+        )
+        return {key: parse_bandit_output(issues_by_path[path]) for key, path in paths.items()}
+
+    except asyncio.TimeoutError:
+        error = 'Security analysis timed out'
+    except Exception as e:
+        error = f'Security analysis failed: {str(e)}'
+
+    return {key: {
+        'security_issues': [],
+        'summary': {'total_issues': 0, 'high': 0, 'medium': 0, 'low': 0},
+        'success': False,
+        'error': error
+    } for key in filenames}
+
+async def run_batch_analysis(sources: Dict[str, str]) -> Tuple[Dict[str, dict], Dict[str, dict]]:
+    """Write all sources into one directory and lint and scan them together"""
+    with tempfile.TemporaryDirectory(dir=SCRATCH_DIR) as temp_dir:
+        filenames = await anyio.to_thread.run_sync(write_batch_files, temp_dir, sources)
+        return await asyncio.gather(
+            run_flake8_batch(temp_dir, filenames),
+            run_security_batch(temp_dir, filenames)
+        )
+
+# ===== RESULT CACHE =====
+
+class ResultCache:
+    """Bounded LRU cache of tool results keyed by content hash"""
+
+    def __init__(self, maxsize: int = 512):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+
+    def get(self, key) -> Optional[dict]:
+        result = self.entries.get(key)
+        if result is not None:
+            self.entries.move_to_end(key)
+        return result
+
+    def put(self, key, result: dict):
+        self.entries[key] = result
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+# One cache per tool, so editing only the tests keeps the lint and security results warm
+lint_cache = ResultCache()
+security_cache = ResultCache()
+test_cache = ResultCache()
+
+def content_hash(text: Optional[str]) -> str:
+    """SHA-256 hex digest of text, treating None as empty"""
+    return hashlib.sha256((text or '').encode()).hexdigest()
+
+async def cached_analysis(cache: ResultCache, key, analysis: Callable, *args) -> dict:
+    """Return the cached result for key, or run the analysis and cache it if it succeeded"""
+    result = cache.get(key)
+    if result is None:
+        result = await analysis(*args)
+        if result['success']:
+            # raw_output never reaches the response; don't hold a copy of it for every entry
+            cache.put(key, {k: v for k, v in result.items() if k != 'raw_output'})
+    return result
 
 # ===== API ENDPOINTS =====
 
+THREAD_LIMIT = 100
+
+@app.on_event("startup")
+async def load_analyzers():
+    global flake8_guide, pytest_context, pytest_slots
+    # Analyzer threads share AnyIO's default limiter with FastAPI's sync endpoints
+    anyio.to_thread.current_default_thread_limiter().total_tokens = THREAD_LIMIT
+    flake8_guide = await anyio.to_thread.run_sync(create_flake8_guide)
+    pytest_context = create_pytest_context()
+    pytest_slots = asyncio.Semaphore(PYTEST_WORKERS)
+
+WARMUP_CODE = "def add(a, b):\n    return a + b\n"
+WARMUP_TESTS = "def test_add():\n    assert add(1, 2) == 3\n"
+
+@app.on_event("startup")
+async def warm_up_analyzers():
+    # Exercise every tool once so the first real request doesn't pay for cold imports and
+    # page cache; the test run also starts pytest's forkserver
+    code_file = await anyio.to_thread.run_sync(write_temp_file, WARMUP_CODE)
+    try:
+        await asyncio.gather(
+            run_flake8_analysis(code_file),
+            run_security_analysis(code_file),
+            run_pytest_analysis(WARMUP_CODE, WARMUP_TESTS)
+        )
+    finally:
+        remove_temp_file(code_file)
+
+def build_analysis_result(lint_analysis: dict, security_analysis: dict, test_analysis: dict) -> AnalysisResult:
+    """Combine the three tool results into the API response"""
+    return AnalysisResult(
+        lint_issues=lint_analysis['issues'],
+        lint_summary=lint_analysis['summary'],
+        security_issues=security_analysis['security_issues'],
+        security_summary=security_analysis['summary'],
+        test_results=test_analysis['test_cases'],
+        test_summary=test_analysis['summary'],
+        success=lint_analysis['success'] and security_analysis['success'] and test_analysis['success']
+    )
+
+def failed_analysis_result(error: str) -> AnalysisResult:
+    """Empty API response reporting an error"""
+    return AnalysisResult(
+        lint_issues=[],
+        lint_summary={'total_issues': 0, 'errors': 0, 'warnings': 0, 'info': 0},
+        security_issues=[],
+        security_summary={'total_issues': 0, 'high': 0, 'medium': 0, 'low': 0},
+        test_results=[],
+        test_summary={'total_tests': 0, 'passed': 0, 'failed': 0, 'success': False},
+        success=False,
+        error=error
+    )
+
+def empty_analysis_result() -> AnalysisResult:
+    """API response for a submission with nothing to analyze"""
+    return AnalysisResult(
+        lint_issues=[],
+        lint_summary={'total_issues': 0, 'errors': 0, 'warnings': 0, 'info': 0},
+        security_issues=[],
+        security_summary={'total_issues': 0, 'high': 0, 'medium': 0, 'low': 0},
+        test_results=[],
+        test_summary={'total_tests': 0, 'passed': 0, 'failed': 0, 'success': True},
+        success=True
+    )
+
 @app.post("/analyze", response_model=AnalysisResult)
 async def analyze_code(submission: CodeSubmission):
+    # Blank code has nothing to lint, scan or import, so skip the tools entirely
+    if not submission.code.strip():
+        return empty_analysis_result()
+
     try:
-        lint_analysis = run_flake8_analysis(submission.code)
-        security_analysis = run_security_analysis(submission.code)
-        test_analysis = run_pytest_analysis(submission.code, submission.test_code)
-
-        return AnalysisResult(
-            lint_issues=lint_analysis['issues'],
-            lint_summary=lint_analysis['summary'],
-            security_issues=security_analysis['security_issues'],
-            security_summary=security_analysis['summary'],
-            test_results=test_analysis['test_cases'],
-            test_summary=test_analysis['summary'],
-            success=lint_analysis['success'] and security_analysis['success'] and test_analysis['success']
-        )
+        code_key = content_hash(submission.code)
+        test_key = (code_key, content_hash(submission.test_code))
+
+        # flake8 and bandit read one shared copy of the code, written only if either will run
+        code_file = None
+        if lint_cache.get(code_key) is None or security_cache.get(code_key) is None:
+            code_file = await anyio.to_thread.run_sync(write_temp_file, submission.code)
+
+        try:
+            # Tools are independent, so run them concurrently instead of back to back
+            lint_analysis, security_analysis, test_analysis = await asyncio.gather(
+                cached_analysis(lint_cache, code_key, run_flake8_analysis, code_file),
+                cached_analysis(security_cache, code_key, run_security_analysis, code_file),
+                cached_analysis(test_cache, test_key, run_pytest_analysis, submission.code, submission.test_code)
+            )
+        finally:
+            if code_file:
+                remove_temp_file(code_file)
+
+        return build_analysis_result(lint_analysis, security_analysis, test_analysis)
 
     except Exception as e:
-        return AnalysisResult(
-            lint_issues=[],
-            lint_summary={'total_issues': 0, 'errors': 0, 'warnings': 0, 'info': 0},
-            security_issues=[],
-            security_summary={'total_issues': 0, 'high': 0, 'medium': 0, 'low': 0},
-            test_results=[],
-            test_summary={'total_tests': 0, 'passed': 0, 'failed': 0, 'success': False},
-            success=False,
-            error=str(e)
+        return failed_analysis_result(str(e))
+
+@app.post("/analyze_batch", response_model=List[AnalysisResult])
+async def analyze_batch(batch: BatchSubmission):
+    try:
+        # Blank submissions get an empty result without touching any tool
+        items = [item for item in batch.items if item.code.strip()]
+        code_keys = [content_hash(item.code) for item in items]
+
+        lint_results = {key: lint_cache.get(key) for key in code_keys}
+        security_results = {key: security_cache.get(key) for key in code_keys}
+
+        # Lint and scan every distinct uncached file in one pass instead of one run per item
+        pending = {
+            key: item.code for key, item in zip(code_keys, items)
+            if lint_results[key] is None or security_results[key] is None
+        }
+
+        async def analyze_pending():
+            if not pending:
+                return
+            batch_lint, batch_security = await run_batch_analysis(pending)
+            for key in pending:
+                lint_results[key] = batch_lint[key]
+                security_results[key] = batch_security[key]
+                if batch_lint[key]['success']:
+                    lint_cache.put(key, batch_lint[key])
+                if batch_security[key]['success']:
+                    security_cache.put(key, batch_security[key])
+
+        _, test_analyses = await asyncio.gather(
+            analyze_pending(),
+            asyncio.gather(*(
+                cached_analysis(test_cache, (key, content_hash(item.test_code)),
+                                run_pytest_analysis, item.code, item.test_code)
+                for key, item in zip(code_keys, items)
+            ))
         )
 
+        analyses = iter([
+            build_analysis_result(lint_results[key], security_results[key], test_analysis)
+            for key, test_analysis in zip(code_keys, test_analyses)
+        ])
+        return [next(analyses) if item.code.strip() else empty_analysis_result() for item in batch.items]
+
+    except Exception as e:
+        return [failed_analysis_result(str(e)) for _ in batch.items]
+
 @app.get("/")
 async def root():
     return {"message": "Code Analysis API is running!"}